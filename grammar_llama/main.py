@@ -1,14 +1,21 @@
 from pynput.keyboard import Controller, Key, GlobalHotKeys
-from ollama import ps, show, ResponseError, AsyncClient
+from ollama import ResponseError, AsyncClient
 from pydantic import BaseModel
 from pyperclip import copy, paste  # type: ignore
-from httpx import ConnectError
-from difflib import unified_diff
-from typing import List, Union, Literal, Optional
+from httpx import ConnectError, HTTPError, Limits, Timeout
+from difflib import SequenceMatcher
+from collections import Counter, OrderedDict
+from hashlib import sha256
+from typing import Callable, List, Union, Literal, Optional
 import asyncio
+import json
 import os
 import re
+import shelve
+import signal
 import sys
+import threading
+import time
 
 
 DEFAULT_MODEL = "gemma3"
@@ -22,6 +29,29 @@ DEFAULT_PROMPT = (
     " - tone: One word describing the tone of the message (friendly, casual, professional, sarcastic, etc.)"
     "Use only JSON-safe characters in your response."
 )
+DEFAULT_CACHE_PATH = "~/.cache/grammar-llama/responses.db"
+CACHE_MEMORY_ENTRIES = 128
+CACHE_DISK_ENTRIES = 1024
+REQUEST_TIMEOUT = 300.0
+CONNECT_TIMEOUT = 10.0
+CLIPBOARD_POLL_INTERVAL = 0.005
+CLIPBOARD_TIMEOUT = 0.1
+PASTE_SETTLE_DELAY = 0.01
+# Ollama reloads the model whenever num_ctx changes, so the window stays fixed
+# unless the prompt, input and decode budget would not fit in it.
+DEFAULT_CONTEXT_TOKENS = 2048
+CONTEXT_STEP_TOKENS = 1024
+CONTEXT_MARGIN_TOKENS = 128
+MIN_PREDICT_TOKENS = 64
+TYPE_TEXT_THRESHOLD = 500
+MIN_WORD_COUNT = 2
+# Paragraphs of longer selections are corrected concurrently; the Ollama server
+# only runs them in parallel when started with OLLAMA_NUM_PARALLEL > 1.
+PARAGRAPH_BATCH_THRESHOLD = 2000
+PARAGRAPH_SEPARATOR = "\n\n"
+
+TOKEN_PATTERN = re.compile(r"\S+|\s+")
+CORRECTED_TEXT_FIELD = re.compile(r'"corrected_text"\s*:\s*"')
 
 RED = "\033[91m"
 GREEN = "\033[92m"
@@ -38,17 +68,109 @@ def get_prompt() -> str:
     return prompt if prompt else DEFAULT_PROMPT
 
 
+def get_context_tokens() -> int:
+    context_tokens = os.getenv("CHECKER_NUM_CTX")
+    try:
+        return int(context_tokens) if context_tokens else DEFAULT_CONTEXT_TOKENS
+    except ValueError:
+        print(f" - Ignoring invalid CHECKER_NUM_CTX: {context_tokens}")
+        return DEFAULT_CONTEXT_TOKENS
+
+
+def get_cache_path() -> str:
+    cache_path = os.getenv("CHECKER_CACHE_PATH")
+    return os.path.expanduser(cache_path if cache_path else DEFAULT_CACHE_PATH)
+
+
 def is_mac() -> bool:
     return sys.platform.startswith("darwin")
 
 
-def chunk_text(text: str) -> List[str]:
-    return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+def tokenize_text(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text)
+
+
+def chat_options(prompt: str, text: str) -> dict:
+    approx_tokens = max(MIN_PREDICT_TOKENS, len(text) // 3)
+    num_predict = approx_tokens * 3
+    required = len(prompt) // 3 + approx_tokens + num_predict + CONTEXT_MARGIN_TOKENS
+    num_ctx = CONTEXT_TOKENS
+    if required > num_ctx:
+        num_ctx = -(-required // CONTEXT_STEP_TOKENS) * CONTEXT_STEP_TOKENS
+    return {
+        "num_ctx": num_ctx,
+        "num_predict": num_predict,
+        "temperature": 0,
+    }
+
+
+def _chat_content(line: str) -> str:
+    part = json.loads(line)
+    if part.get("error"):
+        raise ResponseError(part["error"])
+    return (part.get("message") or {}).get("content") or ""
+
+
+def _cache_key(model: str, prompt: str, text: str) -> str:
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "text": text}, sort_keys=True
+    )
+    return sha256(payload.encode("utf-8")).hexdigest()
 
 
 MODEL = get_model()
 PROMPT = get_prompt()
 IS_MAC = is_mac()
+CONTEXT_TOKENS = get_context_tokens()
+MODIFIER_KEY = Key.cmd if IS_MAC else Key.ctrl
+
+
+def _quartz_combo() -> Callable[[str], None]:
+    import Quartz  # type: ignore
+    from pynput._util.darwin import get_unicode_to_keycode_map  # type: ignore
+
+    # Look the keys up in the active layout, as pynput does, so that non-QWERTY
+    # layouts still send Cmd+C/Cmd+V rather than whatever sits at the ANSI keys.
+    layout = get_unicode_to_keycode_map()
+    keycodes = {key: layout[key] for key in ("c", "v")}
+
+    def send(key: str) -> None:
+        for key_down in (True, False):
+            event = Quartz.CGEventCreateKeyboardEvent(None, keycodes[key], key_down)
+            Quartz.CGEventSetFlags(event, Quartz.kCGEventFlagMaskCommand)
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+
+    return send
+
+
+def _xtest_combo() -> Callable[[str], None]:
+    from Xlib import X, XK  # type: ignore
+    from Xlib.display import Display  # type: ignore
+    from Xlib.ext import xtest  # type: ignore
+
+    display = Display()
+    modifier = display.keysym_to_keycode(XK.XK_Control_L)
+
+    def send(key: str) -> None:
+        keycode = display.keysym_to_keycode(XK.string_to_keysym(key))
+        xtest.fake_input(display, X.KeyPress, modifier)
+        xtest.fake_input(display, X.KeyPress, keycode)
+        xtest.fake_input(display, X.KeyRelease, keycode)
+        xtest.fake_input(display, X.KeyRelease, modifier)
+        display.sync()
+
+    return send
+
+
+def load_fast_combo() -> Optional[Callable[[str], None]]:
+    try:
+        if IS_MAC:
+            return _quartz_combo()
+        if os.getenv("DISPLAY"):
+            return _xtest_combo()
+    except Exception as e:
+        print(f" - Falling back to pynput for key combos: {e}")
+    return None
 
 
 class Response(BaseModel):
@@ -58,26 +180,189 @@ class Response(BaseModel):
     tone: str
 
 
+RESPONSE_SCHEMA = Response.model_json_schema()
+RESPONSE_VALIDATOR = Response.__pydantic_validator__
+
+
+class CorrectedTextStream:
+    def __init__(self):
+        self.buffer = ""
+        self.position: Optional[int] = None
+        self.finished = False
+
+    def read_escape(self) -> Optional[str]:
+        end = self.position + 2
+        if self.buffer[self.position + 1 : end] == "u":
+            end = self.position + 6
+            if "\\ud800" <= self.buffer[self.position : end].lower() < "\\udc00":
+                end += 6
+
+        if end > len(self.buffer):
+            return None
+
+        escape = json.loads(f'"{self.buffer[self.position : end]}"')
+        self.position = end
+        return escape
+
+    def feed(self, content: str) -> str:
+        self.buffer += content
+        if self.finished:
+            return ""
+
+        if self.position is None:
+            match = CORRECTED_TEXT_FIELD.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+
+        decoded = []
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            if char == '"':
+                self.finished = True
+                break
+            elif char == "\\":
+                escape = self.read_escape()
+                if escape is None:
+                    break
+                decoded.append(escape)
+            else:
+                decoded.append(char)
+                self.position += 1
+
+        return "".join(decoded)
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_entries: int = CACHE_MEMORY_ENTRIES):
+        self.path: Optional[str] = path
+        self.max_entries = max_entries
+        self.memory: OrderedDict[str, str] = OrderedDict()
+        self.lock = asyncio.Lock()
+        # Held by the worker thread itself, since a cancelled get/set releases
+        # self.lock while its executor job still has the shelve file open.
+        self.disk_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            print(f" - Disabling on-disk response cache: {e}")
+            self.path = None
+
+    def remember(self, key: str, value: str) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def read_disk(self, key: str) -> Optional[str]:
+        with self.disk_lock, shelve.open(self.path) as db:
+            entry = db.get(key)
+        return entry[1] if isinstance(entry, tuple) else None
+
+    def write_disk(self, key: str, value: str) -> None:
+        # Entries are stored with their write time so the oldest can be evicted
+        # once the file holds more than CACHE_DISK_ENTRIES responses.
+        with self.disk_lock, shelve.open(self.path) as db:
+            db[key] = (time.time(), value)
+            overflow = len(db) - CACHE_DISK_ENTRIES
+            if overflow > 0:
+                written = {
+                    k: v[0] if isinstance(v, tuple) else 0.0 for k, v in db.items()
+                }
+                oldest = sorted(written, key=written.__getitem__)[:overflow]
+                for stale_key in oldest:
+                    del db[stale_key]
+
+    async def get(self, key: str) -> Optional[str]:
+        async with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+
+            if self.path is None:
+                return None
+
+            loop = asyncio.get_running_loop()
+            try:
+                value = await loop.run_in_executor(None, self.read_disk, key)
+            except Exception as e:
+                print(f" - Unable to read response cache: {e}")
+                return None
+
+            if value is not None:
+                self.remember(key, value)
+            return value
+
+    async def set(self, key: str, value: str) -> None:
+        async with self.lock:
+            self.remember(key, value)
+            if self.path is None:
+                return
+
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self.write_disk, key, value)
+            except Exception as e:
+                print(f" - Unable to write response cache: {e}")
+
+
 class GrammarChecker:
     def __init__(self):
         self.controller = Controller()
         self.model = get_model()
         self.prompt = get_prompt()
-        self.is_mac = is_mac()
-        self.modifier_key = Key.cmd if self.is_mac else Key.ctrl
+        self.is_mac = IS_MAC
+        self.modifier_key = MODIFIER_KEY
+        self.fast_combo = load_fast_combo()
         self.hotkey = self.get_hotkey_combo()
 
-        self.current_task: Optional[asyncio.Task] = None
-        self.client = AsyncClient()
-        self.lock = asyncio.Lock()
-        self.cancelled = False
+        self.tasks: List[asyncio.Task] = []
+        self.output_job: Optional[asyncio.Future] = None
+        self.previous_clipboard: Optional[str] = None
+        self.last_corrected_text: Optional[str] = None
+        self.client = AsyncClient(
+            limits=Limits(
+                max_keepalive_connections=8,
+                max_connections=16,
+                keepalive_expiry=30.0,
+            ),
+            timeout=Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+        self.http = self.client._client
+        self.chat_prefix = self.build_chat_prefix()
+        self.cache = ResponseCache(get_cache_path())
+
+    def build_chat_prefix(self) -> bytes:
+        request = json.dumps(
+            {
+                "model": self.model,
+                "format": RESPONSE_SCHEMA,
+                "stream": True,
+                "messages": [{"role": "user", "content": self.prompt}],
+            },
+            separators=(",", ":"),
+        )
+        # Leave the messages array open so each call only encodes its own text.
+        return (request[: -len("]}")] + ',{"role":"user","content":').encode()
+
+    def build_chat_body(self, text: str) -> bytes:
+        return b"".join(
+            (
+                self.chat_prefix,
+                json.dumps(text).encode(),
+                b'}],"options":',
+                json.dumps(
+                    chat_options(self.prompt, text), separators=(",", ":")
+                ).encode(),
+                b"}",
+            )
+        )
 
-        try:
-            self.run_startup_tasks()
-        except KeyboardInterrupt:
-            sys.exit(0)
-        except Exception as e:
-            print(" - An unhandled exception occurred: {e}")
+    async def aclose(self) -> None:
+        await self.http.aclose()
 
     def get_hotkey_combo(self) -> str:
         hotkey_specification = os.getenv("CHECKER_HOTKEY")
@@ -89,81 +374,113 @@ class GrammarChecker:
         else:
             return "<ctrl>+<alt>+a"
 
-    def run_startup_tasks(self) -> None:
+    async def run_startup_tasks(self) -> None:
         try:
-            ps()
-            show(self.model)
-        except ConnectError:
+            await asyncio.gather(self.client.ps(), self.client.show(self.model))
+        except (ConnectError, ConnectionError):
             print(" - Failed to connect to Ollama.")
             sys.exit(1)
         except ResponseError:
             print(f" - Ollama model {self.model} not found.")
             sys.exit(1)
 
+        await self.warm_model()
+
         print(" + Startup tasks passed.")
         print(f" + Using model: {self.model}")
         print(f" + Using prompt: {self.prompt}\n")
 
-    def print_diff(self, original_text: str, corrected_text: str) -> None:
-        original_chunks = chunk_text(original_text)
-        corrected_chunks = chunk_text(corrected_text)
-        diff = unified_diff(
-            original_chunks,
-            corrected_chunks,
-            lineterm="",
-            fromfile="original",
-            tofile="corrected",
-        )
-
-        for line in diff:
-            if line.startswith("+") and not line.startswith("+++"):
-                print(f"{GREEN}{line}{RESET}")
-            elif line.startswith("-") and not line.startswith("---"):
-                print(f"{RED}{line}{RESET}")
-            else:
-                print(line)
-
-    async def copy_text_at_cursor(self) -> str:
-        with self.controller.pressed(self.modifier_key):
-            self.controller.press("c")
-            self.controller.release("c")
-        await asyncio.sleep(0.1)
-        return paste()
-
-    async def correct_grammar(self, text: str) -> Union[Response, None]:
-        print(f" + Awaiting response from LLM...")
+    async def warm_model(self) -> None:
+        print(f" + Loading model {self.model}...")
         try:
-            chat_task = asyncio.create_task(
-                self.client.chat(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": PROMPT,
-                        },
-                        {
-                            "role": "user",
-                            "content": text,
-                        },
-                    ],
-                    format=Response.model_json_schema(),
-                )
+            await self.client.chat(
+                model=self.model,
+                messages=[{"role": "user", "content": "ok"}],
+                options={"num_ctx": CONTEXT_TOKENS, "num_predict": 1},
             )
+        except (ConnectionError, HTTPError, ResponseError) as e:
+            print(f" - Unable to preload model: {e}")
 
-            while not chat_task.done():
-                if self.cancelled:
-                    chat_task.cancel()
-                    raise asyncio.CancelledError()
-                await asyncio.sleep(0.1)
-
-            response = await chat_task
+    def print_diff(self, original_text: str, corrected_text: str) -> None:
+        original_tokens = tokenize_text(original_text)
+        corrected_tokens = tokenize_text(corrected_text)
+        matcher = SequenceMatcher(a=original_tokens, b=corrected_tokens, autojunk=False)
+
+        output = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                output.append("".join(original_tokens[i1:i2]))
+                continue
+            if tag in ("replace", "delete"):
+                output.append(f"{RED}{''.join(original_tokens[i1:i2])}{RESET}")
+            if tag in ("replace", "insert"):
+                output.append(f"{GREEN}{''.join(corrected_tokens[j1:j2])}{RESET}")
+
+        print("".join(output))
+
+    def press_combo(self, key: str) -> None:
+        if self.fast_combo:
+            self.fast_combo(key)
+            return
 
-            if response and response.message and response.message.content:
-                response_obj = Response.model_validate_json(response.message.content)
+        with self.controller.pressed(self.modifier_key):
+            self.controller.press(key)
+            self.controller.release(key)
 
+    async def copy_text_at_cursor(self) -> str:
+        # pyperclip shells out to xclip/xsel on Linux, so reads go through the
+        # executor to keep the loop responsive while polling.
+        loop = asyncio.get_running_loop()
+        previous_text = await loop.run_in_executor(None, paste)
+        self.previous_clipboard = previous_text
+        self.press_combo("c")
+
+        deadline = loop.time() + CLIPBOARD_TIMEOUT
+        text = await loop.run_in_executor(None, paste)
+        while text == previous_text and loop.time() < deadline:
+            await asyncio.sleep(CLIPBOARD_POLL_INTERVAL)
+            text = await loop.run_in_executor(None, paste)
+        return text
+
+    async def correct_grammar(
+        self, text: str, echo: bool = True
+    ) -> Union[Response, None]:
+        key = _cache_key(self.model, self.prompt, text)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            response_obj = RESPONSE_VALIDATOR.validate_json(cached)
+            if echo:
                 print(
-                    f" + Received corrected content: \n{response_obj.corrected_text}\n"
+                    f" + Using cached corrected content: \n{response_obj.corrected_text}\n"
                 )
+            return response_obj
+
+        if echo:
+            print(" + Awaiting response from LLM...")
+        try:
+            streamed = CorrectedTextStream()
+            body = self.build_chat_body(text)
+            async with self.http.stream("POST", "/api/chat", content=body) as stream:
+                if stream.is_error:
+                    await stream.aread()
+                    raise ResponseError(stream.text, stream.status_code)
+
+                if echo:
+                    print(" + Receiving corrected content: ")
+                async for line in stream.aiter_lines():
+                    if not line:
+                        continue
+
+                    corrected_text = streamed.feed(_chat_content(line))
+                    if corrected_text and echo:
+                        sys.stdout.write(corrected_text)
+                        sys.stdout.flush()
+
+            if echo:
+                print("\n")
+            if streamed.buffer:
+                response_obj = RESPONSE_VALIDATOR.validate_json(streamed.buffer)
+                await self.cache.set(key, response_obj.model_dump_json())
                 return response_obj
 
             else:
@@ -171,8 +488,12 @@ class GrammarChecker:
 
             return None
         except asyncio.CancelledError:
-            print(" + Cancelling LLM request...")
+            if echo:
+                print(" + Cancelling LLM request...")
             raise
+        except ConnectError:
+            print(" - Failed to connect to Ollama.")
+            return None
         except ResponseError:
             print(" - Unable to get response from Ollama.")
             return None
@@ -180,65 +501,159 @@ class GrammarChecker:
             print(f" - An unexpected error occurred: {e}")
             return None
 
+    async def correct_paragraphs(self, text: str) -> Union[Response, None]:
+        paragraphs = text.split(PARAGRAPH_SEPARATOR)
+        if sum(1 for p in paragraphs if p.strip()) < 2:
+            return await self.correct_grammar(text)
+
+        pending = [
+            self.correct_grammar(paragraph, echo=False)
+            for paragraph in paragraphs
+            if paragraph.strip()
+        ]
+        print(f" + Correcting {len(pending)} paragraphs concurrently...")
+        try:
+            results = iter(await asyncio.gather(*pending))
+        except asyncio.CancelledError:
+            print(" + Cancelling LLM requests...")
+            raise
+        responses = [next(results) if p.strip() else None for p in paragraphs]
+
+        corrected = [r for r in responses if r is not None]
+        if len(corrected) != len(pending):
+            print(" - Failed to correct every paragraph.")
+            return None
+
+        response_obj = Response(
+            original_grammar_strength=min(
+                r.original_grammar_strength for r in corrected
+            ),
+            corrected_text=PARAGRAPH_SEPARATOR.join(
+                p if r is None else r.corrected_text
+                for p, r in zip(paragraphs, responses)
+            ),
+            summary_of_corrections=" ".join(
+                r.summary_of_corrections for r in corrected
+            ),
+            tone=Counter(r.tone for r in corrected).most_common(1)[0][0],
+        )
+        print(f" + Received corrected content: \n{response_obj.corrected_text}\n")
+        return response_obj
+
     async def paste_text_at_cursor(self) -> None:
-        with self.controller.pressed(self.modifier_key):
-            self.controller.press("v")
-            self.controller.release("v")
-        await asyncio.sleep(0.1)
+        self.press_combo("v")
+        await asyncio.sleep(PASTE_SETTLE_DELAY)
+
+    def can_type_text(self, text: str) -> bool:
+        # pynput types newlines and tabs as Enter/Tab, which would submit forms
+        # or move focus, so only short single-line text skips the clipboard.
+        if len(text) >= TYPE_TEXT_THRESHOLD:
+            return False
+        return not any(c in text for c in "\n\r\t")
+
+    def type_and_restore(self, text: str, previous_clipboard: Optional[str]) -> None:
+        self.controller.type(text)
+        if previous_clipboard is not None:
+            copy(previous_clipboard)
+
+    async def run_output_job(self, func: Callable, *args) -> None:
+        # Worker threads cannot be interrupted, so the job is kept on self and
+        # shielded; the next activation waits for it before using the clipboard.
+        loop = asyncio.get_running_loop()
+        self.output_job = loop.run_in_executor(None, func, *args)
+        await asyncio.shield(self.output_job)
+
+    async def type_text_at_cursor(self, text: str) -> None:
+        await self.run_output_job(self.type_and_restore, text, self.previous_clipboard)
 
     def summarize_grammar(self, response: Response) -> None:
         print(f"\n + Original text score: {response.original_grammar_strength}")
         print(f"\n + Original text tone: {response.tone}")
         print(f" + Summary of corrections: {response.summary_of_corrections}\n")
 
-    async def process_text(self) -> None:
-        self.cancelled = False
-        async with self.lock:
-            original_text = await self.copy_text_at_cursor()
-            print(f"\n + Copied text:\n{original_text}\n")
-
+    def render_output(self, original_text: str, response: Response) -> None:
+        self.print_diff(original_text, response.corrected_text)
+        self.summarize_grammar(response)
+
+    async def process_text(self, previous: List[asyncio.Task]) -> None:
+        if previous:
+            # Let replaced tasks finish unwinding before touching the clipboard;
+            # asyncio.wait does not re-raise their CancelledError.
+            await asyncio.wait(previous)
+        if self.output_job and not self.output_job.done():
+            await asyncio.wait([self.output_job])
+
+        original_text = await self.copy_text_at_cursor()
+        print(f"\n + Copied text:\n{original_text}\n")
+
+        if len(original_text.split()) < MIN_WORD_COUNT:
+            print(" - Copied text is too short to correct; skipping.")
+            return
+        if original_text == self.last_corrected_text:
+            print(" + Copied text is already corrected; skipping.")
+            return
+
+        if len(original_text) > PARAGRAPH_BATCH_THRESHOLD:
+            response = await self.correct_paragraphs(original_text)
+        else:
             response = await self.correct_grammar(original_text)
 
-            if response and response.corrected_text:
-                self.print_diff(original_text, response.corrected_text)
-                self.summarize_grammar(response)
-                copy(response.corrected_text)
-                await self.paste_text_at_cursor()
+        if response and response.corrected_text:
+            self.last_corrected_text = response.corrected_text
+            loop = asyncio.get_running_loop()
+            render = loop.run_in_executor(
+                None, self.render_output, original_text, response
+            )
+            if self.can_type_text(response.corrected_text):
+                await self.type_text_at_cursor(response.corrected_text)
             else:
-                print(" - Correction failed; skipping paste.")
+                await self.run_output_job(copy, response.corrected_text)
+                await self.paste_text_at_cursor()
+            await render
+        else:
+            print(" - Correction failed; skipping paste.")
 
-    async def handle_hotkey(self) -> None:
-        if self.current_task and not self.current_task.done():
-            self.cancelled = True
-            self.current_task.cancel()
+    def handle_hotkey(self) -> None:
+        # Every unfinished task is carried forward, since a task cancelled
+        # before it first ran never waits on the one it replaced.
+        previous = [task for task in self.tasks if not task.done()]
+        for task in previous:
+            task.cancel()
 
-        self.cancelled = False
-        self.current_task = asyncio.create_task(self.process_text())
+        self.tasks = previous + [asyncio.create_task(self.process_text(previous))]
 
 
 async def main_async():
     checker = GrammarChecker()
     loop = asyncio.get_event_loop()
+    await checker.run_startup_tasks()
 
     def on_activate():
-        asyncio.run_coroutine_threadsafe(coro=checker.handle_hotkey(), loop=loop)
+        loop.call_soon_threadsafe(checker.handle_hotkey)
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except NotImplementedError:
+            pass
 
     hotkey_handler = GlobalHotKeys({checker.hotkey: on_activate})
     hotkey_handler.start()
 
     try:
-        while True:
-            await asyncio.sleep(1)
+        await stop.wait()
+        print(" + Shutting down...")
     except asyncio.CancelledError:
         pass
     finally:
         hotkey_handler.stop()
-        if checker.current_task and not checker.current_task.done():
-            checker.current_task.cancel()
-            try:
-                loop.run_until_complete(checker.current_task)
-            except asyncio.CancelledError:
-                pass
+        pending = [task for task in checker.tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        await checker.aclose()
 
 
 def main():